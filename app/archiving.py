@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from app.models import ArchivedTask, Task, TaskStatus
+
+# Fields copied verbatim from a live task into its archived row
+ARCHIVED_FIELDS = [
+    "id",
+    "list_id",
+    "name",
+    "description",
+    "priority",
+    "status",
+    "is_complete",
+    "created_at",
+    "updated_at",
+]
+
+
+def archivable_tasks(older_than_days):
+    """
+    Tasks that were completed (status or flag) and haven't been touched for
+    more than `older_than_days` days. `updated_at` stands in for the
+    completion date since tasks don't record when they were completed.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return Task.objects.filter(
+        Q(status=TaskStatus.COMPLETED) | Q(is_complete=True),
+        updated_at__lt=cutoff,
+    )
+
+
+def archive_batch(older_than_days, batch_size, after_id=0):
+    """
+    Moves a single batch of archivable tasks with ids above `after_id` into
+    the archive table. Returns how many were moved and the last id seen, so
+    the next batch starts where this one stopped. Rows locked by another
+    archiver are skipped. A task can already be in the archive if it was
+    saved back into the live table after being archived (e.g. by a PUT that
+    loaded it first); its archived copy is refreshed before the live row is
+    deleted.
+    """
+    with transaction.atomic():
+        tasks = list(
+            archivable_tasks(older_than_days)
+            .filter(id__gt=after_id)
+            .order_by("id")
+            .select_for_update(skip_locked=True)
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not tasks:
+            return 0, after_id
+        ArchivedTask.objects.bulk_create(
+            [ArchivedTask(**task) for task in tasks],
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=[field for field in ARCHIVED_FIELDS if field != "id"]
+            + ["archived_at"],
+        )
+        Task.objects.filter(id__in=[task["id"] for task in tasks]).delete()
+    return len(tasks), tasks[-1]["id"]
+
+
+def archive_completed_tasks(older_than_days=None, batch_size=None):
+    """
+    Moves every archivable task into the archive table, one batch per
+    transaction so the live table is never locked for long.
+    """
+    if older_than_days is None:
+        older_than_days = settings.TASK_ARCHIVE_AFTER_DAYS
+    if batch_size is None:
+        batch_size = settings.TASK_ARCHIVE_BATCH_SIZE
+
+    total = 0
+    last_id = 0
+    while True:
+        moved, last_id = archive_batch(older_than_days, batch_size, last_id)
+        if not moved:
+            return total
+        total += moved
@@ -0,0 +1,94 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def _cache():
+    return caches[settings.IDEMPOTENCY_CACHE_ALIAS]
+
+
+def _cache_key(request, key):
+    # Keys are scoped per user and per endpoint so clients can't collide
+    user_id = request.user.pk if request.user.is_authenticated else "anon"
+    raw = f"{user_id}:{request.method}:{request.path}:{key}"
+    return "idempotency:" + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _replay(stored, fingerprint):
+    if stored["fingerprint"] != fingerprint:
+        return Response(
+            {"detail": "Idempotency-Key was already used with a different payload."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(stored["data"], status=stored["status"])
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(handler):
+    """
+    Makes an APIView handler honour the Idempotency-Key header: the first
+    response for a key is stored, and retries with the same key get the
+    stored response back without running the handler again. Concurrent
+    retries wait on a short lock held by the first request.
+
+    Only the status and body are stored, never headers or cookies, so
+    handlers shouldn't put credentials in a response they return here.
+    """
+
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return handler(self, request, *args, **kwargs)
+
+        cache = _cache()
+        cache_key = _cache_key(request, key)
+        lock_key = cache_key + ":lock"
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_TIMEOUT
+        while True:
+            stored = cache.get(cache_key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+            if cache.add(lock_key, True, timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT):
+                # The previous holder may have stored its response and let go
+                # of the lock between our read and the add
+                stored = cache.get(cache_key)
+                if stored is None:
+                    break
+                cache.delete(lock_key)
+                return _replay(stored, fingerprint)
+            if time.monotonic() >= deadline:
+                return Response(
+                    {"detail": "A request with this Idempotency-Key is still being processed."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            time.sleep(0.05)
+
+        try:
+            response = handler(self, request, *args, **kwargs)
+            # Server errors are left out so the client can retry them
+            if response.status_code < 500:
+                cache.set(
+                    cache_key,
+                    {
+                        "fingerprint": fingerprint,
+                        "status": response.status_code,
+                        "data": response.data,
+                    },
+                    timeout=settings.IDEMPOTENCY_KEY_TTL,
+                )
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    return wrapper
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.archiving import archive_completed_tasks
+
+
+class Command(BaseCommand):
+    help = "Moves tasks completed more than N days ago into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TASK_ARCHIVE_AFTER_DAYS,
+            help="Archive tasks completed more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_ARCHIVE_BATCH_SIZE,
+            help="How many tasks to move per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        total = archive_completed_tasks(options["days"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} task(s)."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_create_tasks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('priority', models.CharField(choices=[('low', 'low'), ('medium', 'medium'), ('high', 'high')], max_length=6)),
+                ('status', models.CharField(choices=[('not-started', 'not-started'), ('in-progress', 'in-progress'), ('completed', 'completed')], max_length=11)),
+                ('is_complete', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.list')),
+            ],
+            options={
+                'db_table': 'tasks_archive',
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('app', '0003_create_tasks_archive'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # Indexes on auth_user backing the user directory: keyset paging on
+        # (date_joined, id) and prefix/trigram search on email and first name.
+        # Built concurrently so registrations aren't blocked meanwhile. No
+        # IF NOT EXISTS: a failed concurrent build leaves an INVALID index
+        # behind, and a retry should fail loudly instead of skipping it.
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY auth_user_date_joined_id_idx ON auth_user (date_joined DESC, id DESC);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS auth_user_date_joined_id_idx;',
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY auth_user_email_upper_trgm ON auth_user USING gin (UPPER(email) gin_trgm_ops);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS auth_user_email_upper_trgm;',
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY auth_user_first_name_upper_trgm ON auth_user USING gin (UPPER(first_name) gin_trgm_ops);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS auth_user_first_name_upper_trgm;',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_user_directory_indexes'),
+    ]
+
+    operations = [
+        # Table for the "idempotency" DatabaseCache, in the layout
+        # `createcachetable` uses. Its name must match CACHES LOCATION.
+        migrations.RunSQL(
+            sql=[
+                'CREATE TABLE idempotency_cache (cache_key varchar(255) NOT NULL PRIMARY KEY, value text NOT NULL, expires timestamp with time zone NOT NULL);',
+                'CREATE INDEX idempotency_cache_expires ON idempotency_cache (expires);',
+            ],
+            reverse_sql='DROP TABLE idempotency_cache;',
+        ),
+    ]
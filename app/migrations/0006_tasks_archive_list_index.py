@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_create_idempotency_cache'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['list', '-archived_at', '-id'], name='tasks_archive_list_idx'),
+        ),
+    ]
@@ -65,3 +65,33 @@ class Task(models.Model):
 
     class Meta:
         db_table = "tasks"
+
+
+class ArchivedTask(models.Model):
+    # Keeps the original task id so archived rows can be traced back
+    id = models.BigIntegerField(primary_key=True)
+    list = models.ForeignKey(List, on_delete=models.CASCADE)
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+    priority = models.CharField(
+        max_length=6,
+        choices=TaskPriority.choices,
+    )
+    status = models.CharField(
+        max_length=11,
+        choices=TaskStatus.choices,
+    )
+    is_complete = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "tasks_archive"
+        indexes = [
+            # Keyset paging of a list's archive, newest first
+            models.Index(
+                fields=["list", "-archived_at", "-id"],
+                name="tasks_archive_list_idx",
+            ),
+        ]
@@ -0,0 +1,115 @@
+import base64
+import binascii
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+ESTIMATED_COUNT_TIMEOUT = 60 * 5
+
+
+def estimated_count(model):
+    """
+    Row estimate for the model's table from the planner statistics, cached
+    for a few minutes. Falls back to an exact count on tables that were
+    never analyzed.
+    """
+    table = model._meta.db_table
+    cache_key = f"estimated_count:{table}"
+    count = cache.get(cache_key)
+    if count is None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [table],
+            )
+            count = cursor.fetchone()[0]
+        if count < 0:
+            count = model.objects.count()
+        cache.set(cache_key, count, ESTIMATED_COUNT_TIMEOUT)
+    return count
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pages newest-first on (`ordering_field`, id) using the last row seen as
+    the cursor, so deep pages are an index range scan like the first one and
+    no COUNT(*) is run. An estimated count is added with `?count=estimated`
+    when the view's `get_estimated_count` returns one.
+    """
+
+    ordering_field = "date_joined"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    page_size = api_settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            value, pk = cursor
+            # The `<=` bound gives Postgres an index condition on the
+            # (ordering_field, id) index; the OR only breaks ties
+            queryset = queryset.filter(**{f"{self.ordering_field}__lte": value}).filter(
+                Q(**{f"{self.ordering_field}__lt": value}) | Q(id__lt=pk)
+            )
+
+        rows = list(
+            queryset.order_by(f"-{self.ordering_field}", "-id")[: self.page_size + 1]
+        )
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        response = {"next": self.get_next_link(), "results": data}
+        get_estimated_count = getattr(self.view, "get_estimated_count", None)
+        if (
+            self.request.query_params.get(self.count_query_param) == "estimated"
+            and get_estimated_count is not None
+        ):
+            count = get_estimated_count()
+            if count is not None:
+                response["estimatedCount"] = count
+        return Response(response)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(getattr(last, self.ordering_field), last.pk),
+        )
+
+    def encode_cursor(self, value, pk):
+        raw = f"{value.isoformat()}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            value, pk = raw.split("|")
+            value = parse_datetime(value)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if value is None:
+            raise NotFound("Invalid cursor")
+        return value, pk
+
+
+class ArchivedTaskPagination(KeysetPagination):
+    ordering_field = "archived_at"
@@ -1,6 +1,6 @@
 from django.contrib.auth.models import Group, User
 from rest_framework import serializers
-from app.models import List, Task
+from app.models import ArchivedTask, List, Task
 
 
 class UserSerializer(serializers.HyperlinkedModelSerializer):
@@ -69,3 +69,27 @@ class TaskSerializer(serializers.ModelSerializer):
             "createdAt",
             "updatedAt",
         ]
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    listId = serializers.IntegerField(source="list_id", read_only=True)
+    isComplete = serializers.BooleanField(source="is_complete", read_only=True)
+    createdAt = serializers.DateTimeField(source="created_at", read_only=True)
+    updatedAt = serializers.DateTimeField(source="updated_at", read_only=True)
+    archivedAt = serializers.DateTimeField(source="archived_at", read_only=True)
+
+    class Meta:
+        model = ArchivedTask
+        fields = [
+            "id",
+            "listId",
+            "name",
+            "description",
+            "priority",
+            "status",
+            "isComplete",
+            "createdAt",
+            "updatedAt",
+            "archivedAt",
+        ]
+        read_only_fields = fields
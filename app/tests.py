@@ -1,3 +1,346 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+
+from app.archiving import archive_batch, archive_completed_tasks
+from app.idempotency import _cache_key, idempotent
+from app.models import ArchivedTask, List, Task
+
+
+class ArchivingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="ana@example.com", email="ana@example.com", password="secret"
+        )
+        self.list = List.objects.create(
+            user=self.user, name="Groceries", priority="low", status="in-progress"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_task(self, days_ago, status="completed", is_complete=False):
+        task = Task.objects.create(
+            list=self.list,
+            name="Milk",
+            priority="low",
+            status=status,
+            is_complete=is_complete,
+        )
+        # update() skips auto_now, so updated_at can be moved into the past
+        Task.objects.filter(pk=task.pk).update(
+            updated_at=timezone.now() - timedelta(days=days_ago)
+        )
+        return task
+
+    def test_archives_only_old_completed_tasks(self):
+        by_status = self.create_task(40)
+        by_flag = self.create_task(40, status="in-progress", is_complete=True)
+        recent = self.create_task(5)
+        still_open = self.create_task(40, status="in-progress")
+
+        self.assertEqual(archive_completed_tasks(30, 100), 2)
+
+        self.assertEqual(
+            set(ArchivedTask.objects.values_list("id", flat=True)),
+            {by_status.pk, by_flag.pk},
+        )
+        self.assertEqual(
+            set(Task.objects.values_list("id", flat=True)), {recent.pk, still_open.pk}
+        )
+
+    def test_batches_resume_after_the_last_archived_id(self):
+        tasks = [self.create_task(40) for _ in range(5)]
+
+        moved, last_id = archive_batch(30, 2)
+        self.assertEqual((moved, last_id), (2, tasks[1].pk))
+        moved, last_id = archive_batch(30, 2, last_id)
+        self.assertEqual((moved, last_id), (2, tasks[3].pk))
+
+        self.assertEqual(archive_completed_tasks(30, 2), 1)
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(ArchivedTask.objects.count(), 5)
+
+    def test_task_already_archived_refreshes_its_copy(self):
+        task = self.create_task(40)
+        archive_completed_tasks(30, 100)
+        # A stale save re-inserts the task into the live table with its old id
+        task.name = "Oat milk"
+        task.save()
+        Task.objects.filter(pk=task.pk).update(
+            updated_at=timezone.now() - timedelta(days=40)
+        )
+
+        self.assertEqual(archive_completed_tasks(30, 100), 1)
+
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(ArchivedTask.objects.get(pk=task.pk).name, "Oat milk")
+
+    def test_command_archives_with_given_cutoff(self):
+        self.create_task(10)
+
+        call_command("archive_tasks", days=30, stdout=StringIO())
+        self.assertEqual(ArchivedTask.objects.count(), 0)
+
+        call_command("archive_tasks", days=7, batch_size=1, stdout=StringIO())
+        self.assertEqual(ArchivedTask.objects.count(), 1)
+
+    def test_archived_tasks_are_listed_in_pages(self):
+        self.create_task(1, status="in-progress")
+        for _ in range(12):
+            self.create_task(40)
+        archive_completed_tasks(30, 100)
+
+        url = f"/api/lists/{self.list.pk}/tasks/"
+        live = self.client.get(url)
+        first = self.client.get(url, {"archived": "true"})
+        second = self.client.get(first.json()["next"])
+
+        self.assertEqual(len(live.json()), 1)
+        self.assertEqual(len(first.json()["results"]), 10)
+        self.assertEqual(len(second.json()["results"]), 2)
+        self.assertIsNone(second.json()["next"])
+        self.assertEqual(
+            {task["id"] for task in first.json()["results"] + second.json()["results"]},
+            set(ArchivedTask.objects.values_list("id", flat=True)),
+        )
+
+    def test_archived_tasks_of_another_users_list_are_forbidden(self):
+        other = User.objects.create_user(
+            username="bia@example.com", email="bia@example.com", password="secret"
+        )
+        client = APIClient()
+        client.force_authenticate(other)
+
+        response = client.get(f"/api/lists/{self.list.pk}/tasks/", {"archived": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="ana@example.com", email="ana@example.com", password="secret"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.payload = {"name": "Groceries", "priority": "low", "status": "not-started"}
+
+    def test_retry_replays_stored_response(self):
+        first = self.client.post(
+            "/api/lists/", self.payload, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+        )
+        second = self.client.post(
+            "/api/lists/", self.payload, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+        )
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(List.objects.count(), 1)
+
+    def test_without_key_every_request_writes(self):
+        self.client.post("/api/lists/", self.payload, format="json")
+        self.client.post("/api/lists/", self.payload, format="json")
+
+        self.assertEqual(List.objects.count(), 2)
+
+    def test_key_reused_with_different_payload_is_rejected(self):
+        self.client.post(
+            "/api/lists/", self.payload, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+        )
+        response = self.client.post(
+            "/api/lists/",
+            {**self.payload, "name": "Chores"},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="abc",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(List.objects.count(), 1)
+
+    @override_settings(IDEMPOTENCY_LOCK_TIMEOUT=0)
+    def test_concurrent_duplicate_gets_conflict_when_lock_is_held(self):
+        request = APIRequestFactory().post("/api/lists/", {}, format="json")
+        request.user = self.user
+        lock_key = _cache_key(request, "abc") + ":lock"
+        caches[settings.IDEMPOTENCY_CACHE_ALIAS].add(lock_key, True)
+
+        response = self.client.post(
+            "/api/lists/", self.payload, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(List.objects.count(), 0)
+
+    def test_response_stored_before_lock_is_taken_is_replayed(self):
+        first = self.client.post(
+            "/api/lists/", self.payload, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+        )
+        cache = caches[settings.IDEMPOTENCY_CACHE_ALIAS]
+        request = APIRequestFactory().post("/api/lists/", {}, format="json")
+        request.user = self.user
+        cache_key = _cache_key(request, "abc")
+        stored = cache.get(cache_key)
+        cache.delete(cache_key)
+        real_get = cache.get
+        reads = []
+
+        # The first read misses; the first request then finishes and stores
+        # its response just before this one takes the lock
+        def get(key, *args, **kwargs):
+            if key == cache_key and not reads:
+                reads.append(key)
+                cache.set(cache_key, stored)
+                return None
+            return real_get(key, *args, **kwargs)
+
+        with mock.patch.object(cache, "get", side_effect=get):
+            second = self.client.post(
+                "/api/lists/", self.payload, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+            )
+
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(List.objects.count(), 1)
+        self.assertIsNone(cache.get(cache_key + ":lock"))
+
+    def test_server_errors_are_not_stored(self):
+        calls = []
+
+        class FailingView(APIView):
+            @idempotent
+            def post(self, request):
+                calls.append(request)
+                return Response(status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        view = FailingView.as_view()
+        factory = APIRequestFactory()
+        for _ in range(2):
+            request = factory.post("/failing/", {}, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+            response = view(request)
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        self.assertEqual(len(calls), 2)
+
+    def test_register_retry_issues_fresh_tokens_without_storing_them(self):
+        client = APIClient()
+        payload = {"first_name": "Bia", "email": "bia@example.com", "password": "secret"}
+
+        first = client.post(
+            "/api/register/", payload, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+        )
+        second = client.post(
+            "/api/register/", payload, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+        )
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.json()["user"], first.json()["user"])
+        self.assertIn("access", second.json())
+        self.assertIn("refreshToken", second.cookies)
+        self.assertEqual(User.objects.filter(email="bia@example.com").count(), 1)
+
+        request = APIRequestFactory().post("/api/register/")
+        request.user = AnonymousUser()
+        stored = caches[settings.IDEMPOTENCY_CACHE_ALIAS].get(_cache_key(request, "abc"))
+        self.assertNotIn("access", stored["data"])
+        self.assertNotIn("refresh", stored["data"])
+
+
+class UserDirectoryTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for i in range(25):
+            User.objects.create_user(
+                username=f"user{i}@example.com",
+                email=f"user{i}@example.com",
+                first_name=f"User {i}",
+                # Groups of three share a date_joined, so ties straddle pages
+                date_joined=now - timedelta(days=i // 3),
+            )
+        self.marcelina = User.objects.create_user(
+            username="marcelina.souza@example.com",
+            email="marcelina.souza@example.com",
+            first_name="Marcelina",
+            date_joined=now - timedelta(days=30),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.first())
+        cache.clear()
+
+    def search(self, term, **params):
+        response = self.client.get("/users/", {"search": term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_search_matches_email_prefix(self):
+        results = self.search("MARCELINA.S").json()["results"]
+
+        self.assertEqual([user["id"] for user in results], [self.marcelina.pk])
+
+    def test_search_matches_first_name_prefix(self):
+        results = self.search("marc").json()["results"]
+
+        self.assertEqual([user["id"] for user in results], [self.marcelina.pk])
+
+    def test_search_matches_similar_first_name(self):
+        results = self.search("Marselina").json()["results"]
+
+        self.assertEqual([user["id"] for user in results], [self.marcelina.pk])
+
+    def test_search_is_kept_across_cursor_pages(self):
+        seen = []
+        response = self.search("user")
+        while True:
+            seen.extend(user["id"] for user in response.json()["results"])
+            if not response.json()["next"]:
+                break
+            response = self.client.get(response.json()["next"])
+
+        expected = list(
+            User.objects.filter(email__startswith="user")
+            .order_by("-date_joined", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(len(expected), 25)
+        self.assertEqual(seen, expected)
+
+    def test_estimated_count_is_only_given_without_search(self):
+        plain = self.client.get("/users/", {"count": "estimated"}).json()
+        searched = self.search("marc", count="estimated").json()
+
+        self.assertIsInstance(plain["estimatedCount"], int)
+        self.assertNotIn("estimatedCount", searched)
+        self.assertNotIn("estimatedCount", self.client.get("/users/").json())
+
+    def test_cursor_walks_every_user_once_across_ties(self):
+        seen = []
+        url = "/users/"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.json())
+            seen.extend(user["id"] for user in response.json()["results"])
+            url = response.json()["next"]
+
+        expected = list(
+            User.objects.order_by("-date_joined", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get("/users/", {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
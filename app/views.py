@@ -1,10 +1,15 @@
-from app.models import List, Task
+from app.idempotency import idempotent
+from app.models import ArchivedTask, List, Task
+from app.pagination import ArchivedTaskPagination, KeysetPagination, estimated_count
 from django.contrib.auth.models import Group, User
+from django.db.models import Q
+from django.db.models.functions import Upper
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import permissions, viewsets
 from rest_framework import status
 from app.serializers import (
+    ArchivedTaskSerializer,
     GroupSerializer,
     ListSerializer,
     UserSerializer,
@@ -15,14 +20,41 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(viewsets.ReadOnlyModelViewSet):
     """
-    API endpoint that allows users to be viewed or edited.
+    User directory. `?search=` matches email or first name by prefix or
+    trigram similarity, results are keyset paginated newest-first.
     """
 
-    queryset = User.objects.all().order_by("-date_joined")
+    queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_search_term(self):
+        return self.request.query_params.get("search", "").strip()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        term = self.get_search_term()
+        if self.action != "list" or not term:
+            return queryset
+        # Upper() matches the expressions of the pg_trgm GIN indexes
+        term = term.upper()
+        return queryset.annotate(
+            email_upper=Upper("email"), first_name_upper=Upper("first_name")
+        ).filter(
+            Q(email_upper__startswith=term)
+            | Q(first_name_upper__startswith=term)
+            | Q(email_upper__trigram_similar=term)
+            | Q(first_name_upper__trigram_similar=term)
+        )
+
+    def get_estimated_count(self):
+        # Only the unfiltered directory has a cheap estimate
+        if self.get_search_term():
+            return None
+        return estimated_count(User)
 
 
 class GroupViewSet(viewsets.ModelViewSet):
@@ -91,36 +123,45 @@ class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request):
+        response = self.register(request)
+        if response.status_code != status.HTTP_201_CREATED:
+            return response
+        # Tokens are issued on every call, retries included, so they're never
+        # kept in the idempotency store and are always fresh
+        user = User.objects.get(pk=response.data["id"])
+        refresh = TokenObtainPairSerializer.get_token(user)
+        data = {
+            "user": response.data,
+            "access": str(refresh.access_token),
+            "refresh": str(refresh),
+        }
+        token_response = Response(data, status=status.HTTP_201_CREATED)
+        if response.has_header("Idempotent-Replayed"):
+            token_response["Idempotent-Replayed"] = response["Idempotent-Replayed"]
+        token_response.set_cookie(
+            key="refreshToken",
+            value=str(refresh),
+            httponly=True,
+            secure=True,
+            samesite="None",  # required if frontend and backend are on different domains
+            max_age=60 * 60 * 24 * 7  # example: 7 days
+        )
+        return token_response
+
+    @idempotent
+    def register(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
             user_data = UserSerializer(user, context={"request": request}).data
-            token_serializer = TokenObtainPairSerializer(
-                data={"username": user.username, "password": request.data.get("password")}
-            )
-            if token_serializer.is_valid():
-                data = {
-                    "user": user_data,
-                    "access": token_serializer.validated_data["access"],
-                    "refresh": token_serializer.validated_data["refresh"]
-                }
-                response = Response(data, status=status.HTTP_201_CREATED)
-                response.set_cookie(
-                    key="refreshToken",
-                    value=token_serializer.validated_data["refresh"],
-                    httponly=True,
-                    secure=True,
-                    samesite="None",  # required if frontend and backend are on different domains
-                    max_age=60 * 60 * 24 * 7  # example: 7 days
-                )
-                return response
-            return Response(token_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            return Response(user_data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
 
 class ListCreateListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
     def post(self, request):
         serializer = ListSerializer(data=request.data)
         if serializer.is_valid():
@@ -191,6 +232,7 @@ class ListFindUpdateDeleteView(APIView):
 class TaskCreateListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
     def post(self, request, list_pk):
         try:
             list_item = List.objects.get(pk=list_pk, user=request.user)
@@ -209,6 +251,14 @@ class TaskCreateListView(APIView):
             list_item = List.objects.get(pk=list_pk)
             if list_item.user != request.user:
                 return Response(status=status.HTTP_403_FORBIDDEN)
+            # Archived tasks live in their own table and are only read on request
+            if request.query_params.get("archived") == "true":
+                paginator = ArchivedTaskPagination()
+                tasks = paginator.paginate_queryset(
+                    ArchivedTask.objects.filter(list=list_item), request, view=self
+                )
+                serializer = ArchivedTaskSerializer(tasks, many=True)
+                return paginator.get_paginated_response(serializer.data)
             tasks = Task.objects.filter(list=list_item)
             serializer = TaskSerializer(tasks, many=True)
             return Response(serializer.data)
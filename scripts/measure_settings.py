@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Compares worker startup time, RSS and per-request overhead between the
+default settings and the API-only profile.
+
+    python scripts/measure_settings.py [--requests N] [--runs N]
+
+Each profile is measured in fresh interpreters. Startup is timed by the
+parent, from spawning the worker until it has served its first request, so
+interpreter start, Django setup and URLconf/view imports all count. The
+worker drives the WSGI app with a hand-built environ rather than
+`django.test`, which would preload templates, forms and the ORM in both
+profiles. Requests go to `api/token/logout/`, which doesn't hit the
+database, so the timing is mostly middleware, routing and rendering.
+Reported figures are medians over the runs.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = ["tasking_back.settings", "tasking_back.settings_api"]
+
+
+def worker(requests):
+    import io
+    import resource
+
+    sys.path.insert(0, str(BASE_DIR))
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+
+    def call():
+        environ = {
+            "REQUEST_METHOD": "POST",
+            "PATH_INFO": "/api/token/logout/",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "localhost",
+            "CONTENT_LENGTH": "0",
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+        }
+        response = application(environ, lambda status, headers: None)
+        b"".join(response)
+        response.close()
+
+    call()
+    # Tells the parent the first response is out
+    print("ready", flush=True)
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        call()
+    per_request = (time.perf_counter() - start) / requests
+
+    print(json.dumps({"max_rss_kb": rss_kb, "per_request_s": per_request}))
+
+
+def measure(profile, requests):
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, __file__, "--worker", "--requests", str(requests)],
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": profile},
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    ready = process.stdout.readline()
+    startup = time.perf_counter() - start
+    output = process.stdout.read()
+    if process.wait() != 0 or ready.strip() != "ready":
+        raise RuntimeError(f"Worker for {profile} failed")
+    result = json.loads(output)
+    return startup, result["max_rss_kb"], result["per_request_s"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare settings profiles.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.requests)
+        return
+
+    # Runs alternate between profiles so drift affects both alike
+    results = {profile: [] for profile in PROFILES}
+    for _ in range(args.runs):
+        for profile in PROFILES:
+            results[profile].append(measure(profile, args.requests))
+
+    for profile, runs in results.items():
+        startup, rss_kb, per_request = (statistics.median(values) for values in zip(*runs))
+        print(
+            f"{profile:<28} startup {startup * 1000:>8.1f} ms  "
+            f"rss {rss_kb / 1024:>7.1f} MB  "
+            f"request {per_request * 1_000_000:>8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
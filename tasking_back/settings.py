@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from datetime import timedelta
 from pathlib import Path
+from corsheaders.defaults import default_headers
 from environ import Env
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
+    "django.contrib.postgres",
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
@@ -140,6 +142,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 CORS_ALLOWED_ORIGINS = env("CORS_ALLOWED_ORIGINS")
 CORS_ALLOW_CREDENTIALS = True # Needed, bc front app uses credentials: include and requires cookies
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
 
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -153,3 +156,29 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
+
+# Completed tasks older than this are moved to the archive table by
+# `python manage.py archive_tasks`
+TASK_ARCHIVE_AFTER_DAYS = env.int("TASK_ARCHIVE_AFTER_DAYS", default=30)
+TASK_ARCHIVE_BATCH_SIZE = env.int("TASK_ARCHIVE_BATCH_SIZE", default=1000)
+
+IDEMPOTENCY_CACHE_ALIAS = "idempotency"
+IDEMPOTENCY_KEY_TTL = env.int("IDEMPOTENCY_KEY_TTL", default=60 * 60 * 24)
+# How long a request holds the lock for its key, and how long a concurrent
+# duplicate waits for the first response before giving up with 409
+IDEMPOTENCY_LOCK_TIMEOUT = 10
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Bounded store for replaying POST responses by Idempotency-Key. It lives
+    # in the database so every worker shares the stored responses and locks.
+    # The table is created by app/migrations/0005_create_idempotency_cache.
+    "idempotency": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "idempotency_cache",
+        "TIMEOUT": IDEMPOTENCY_KEY_TTL,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
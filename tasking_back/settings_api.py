@@ -0,0 +1,35 @@
+"""
+API-only settings for tasking_back.
+
+Same as `tasking_back.settings` but without the admin, sessions, messages,
+templates and browsable API, which a JWT-only JSON API never uses. Enable it
+with DJANGO_SETTINGS_MODULE=tasking_back.settings_api.
+"""
+
+from tasking_back.settings import *  # noqa: F401,F403
+from tasking_back.settings import REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.postgres",
+    "rest_framework",
+    "rest_framework_simplejwt",
+    "corsheaders",
+    "app",
+]
+
+# Authentication is done by JWTAuthentication inside DRF, so the session,
+# auth, CSRF, messages and clickjacking middleware have nothing to do here
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+}
@@ -1,3 +1,4 @@
+from django.apps import apps
 from django.urls import include, path
 from rest_framework import routers
 
@@ -8,12 +9,10 @@ router.register(r"users", views.UserViewSet)
 router.register(r"groups", views.GroupViewSet)
 
 # Wire up our API using automatic URL routing.
-# Additionally, we include login URLs for the browsable API.
 urlpatterns = [
     # Additional users endpoints
     path("users/me/", views.UserMeView.as_view(), name="user_me"),
     path("", include(router.urls)),
-    path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
     # Login View with token
     path("api/token/", views.TokenObtainPairViewWrapper.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", views.TokenRefreshViewWrapper.as_view(), name="token_refresh"),
@@ -39,3 +38,10 @@ urlpatterns = [
         name="task_find_update_delete",
     ),
 ]
+
+# Login URLs for the browsable API, which relies on sessions (not available
+# in the API-only settings)
+if apps.is_installed("django.contrib.sessions"):
+    urlpatterns.append(
+        path("api-auth/", include("rest_framework.urls", namespace="rest_framework"))
+    )